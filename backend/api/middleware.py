@@ -0,0 +1,91 @@
+from typing import Iterable
+
+# Methods advertised on preflight; mirrors allow_methods=["*"]
+_ALLOW_METHODS = b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+
+# Prebuilt pieces of the disallowed-preflight response. Messages and header
+# lists are built fresh per send, since outer middleware may edit them in place.
+_DISALLOWED_HEADERS = ((b"content-type", b"text/plain; charset=utf-8"),)
+_DISALLOWED_BODY = b"Disallowed CORS origin"
+
+
+class CORSLite:
+    """
+    Minimal pure-ASGI CORS middleware for a fixed list of allowed origins.
+    Header lists are built once per allowed origin at construction, so the
+    per-request work is a dict lookup and a list extend on http.response.start.
+    Preflight requests are answered with a prebuilt 204 and never reach routing.
+    """
+    def __init__(self, app, allow_origins: Iterable[str] = ()):
+        self.app = app
+        origins = {o.encode("latin-1") for o in allow_origins}
+        self.allow_all = b"*" in origins
+        origins.discard(b"*")
+        self._simple_by_origin = {o: self._simple_headers(o) for o in origins}
+        self._preflight_by_origin = {o: self._preflight_headers(o) for o in origins}
+
+    @staticmethod
+    def _simple_headers(origin: bytes) -> list:
+        # Credentials are allowed, so the origin is echoed back instead of "*"
+        return [
+            (b"access-control-allow-origin", origin),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin"),
+        ]
+
+    @classmethod
+    def _preflight_headers(cls, origin: bytes) -> list:
+        return cls._simple_headers(origin) + [
+            (b"access-control-allow-methods", _ALLOW_METHODS),
+            (b"access-control-max-age", b"600"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        request_headers = None
+        for key, value in scope["headers"]:
+            if key == b"origin":
+                origin = value
+            elif key == b"access-control-request-method":
+                request_method = value
+            elif key == b"access-control-request-headers":
+                request_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        # Preflight: answer directly, never reaches routing
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            headers = self._preflight_by_origin.get(origin)
+            if headers is None and self.allow_all:
+                headers = self._preflight_headers(origin)
+            if headers is None:
+                await send({"type": "http.response.start", "status": 400, "headers": list(_DISALLOWED_HEADERS)})
+                await send({"type": "http.response.body", "body": _DISALLOWED_BODY})
+                return
+            headers = list(headers)
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": 204, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        simple_headers = self._simple_by_origin.get(origin)
+        if simple_headers is None and self.allow_all:
+            simple_headers = self._simple_headers(origin)
+        if simple_headers is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + simple_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Request, HTTPException
+from typing import Any
 from pydantic import BaseModel
-from backend.services.marketing_engine import MarketingEngine
+from starlette.concurrency import run_in_threadpool
+from backend.services.marketing_engine import MarketingEngine, FIVE_PS
 import os
+from urllib.parse import urlparse
 
 # --- Pydantic Model for Request Validation ---
 # This defines the expected structure of the incoming JSON payload.
@@ -20,15 +23,32 @@ class ReGenRequest(FivePsRequest):
 class CleanupRequest(BaseModel):
     image_urls: list[str] = []
 
-class SocialCopyRequest(BaseModel):
+class SocialCopyRequest(FivePsRequest):
     platform: str  # instagram | linkedin | twitter | youtube
-    product: str
-    price: str
-    place: str
-    promotion: str
-    people: str
     feedback: str | None = None
 
+# --- Response Models ---
+# Declared as return types so FastAPI serializes straight to JSON bytes
+# through Pydantic; unset fields are left out to keep the original payloads.
+class CreativesResponse(BaseModel):
+    message: str
+    image_urls: list[str] | None = None
+    image_url: str | None = None
+
+class CleanupResponse(BaseModel):
+    deleted: int
+
+class SocialCopyResponse(BaseModel):
+    title: str
+    caption: str
+    hashtags: Any = []  # model output; usually a list of strings
+    company_name: str
+    handle: str
+    contact_email: str | None = None
+    website: str | None = None
+    phone: str | None = None
+    sponsored: bool
+
 # --- Router ---
 router = APIRouter()
 
@@ -44,8 +64,8 @@ except ValueError as e:
     raise
 
 # --- API Endpoint ---
-@router.post("/api/v1/generate")
-async def generate_ad_creative(payload: FivePsRequest, request: Request):
+@router.post("/api/v1/generate", response_model_exclude_unset=True)
+async def generate_ad_creative(payload: FivePsRequest, request: Request) -> CreativesResponse:
     """
     API endpoint to generate an ad creative from the 5Ps.
     """
@@ -54,7 +74,7 @@ async def generate_ad_creative(payload: FivePsRequest, request: Request):
         fiveps_data = payload.model_dump()
         
         # The generate_creative method now returns a list of web paths
-        result = engine.generate_creative(fiveps_data)
+        result = await engine.generate_creative(fiveps_data)
         
         if result:
             # Construct absolute URLs
@@ -62,17 +82,17 @@ async def generate_ad_creative(payload: FivePsRequest, request: Request):
             if isinstance(result, list):
                 image_urls = [f"{base}{p}" for p in result]
                 # Backward compatibility: also include first as image_url
-                return {
-                    "message": "Creatives generated successfully!",
-                    "image_urls": image_urls,
-                    "image_url": image_urls[0] if image_urls else None
-                }
+                return CreativesResponse(
+                    message="Creatives generated successfully!",
+                    image_urls=image_urls,
+                    image_url=image_urls[0] if image_urls else None,
+                )
             else:
                 image_url = f"{base}{result}"
-                return {
-                    "message": "Creative generated successfully!",
-                    "image_url": image_url
-                }
+                return CreativesResponse(
+                    message="Creative generated successfully!",
+                    image_url=image_url,
+                )
         else:
             # If the engine returns None, it means an internal error occurred.
             raise HTTPException(status_code=500, detail="Failed to generate creative due to an internal engine error.")
@@ -82,18 +102,18 @@ async def generate_ad_creative(payload: FivePsRequest, request: Request):
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
 
 # Optional: expose a tiny root on main app; router keeps endpoints minimal
-@router.post("/api/v1/regenerate")
-async def regenerate_from_selection(payload: ReGenRequest, request: Request):
+@router.post("/api/v1/regenerate", response_model_exclude_unset=True)
+async def regenerate_from_selection(payload: ReGenRequest, request: Request) -> CreativesResponse:
     """Generate 4 new creatives based on a user-selected image + same 5Ps."""
     try:
         fiveps_data = payload.model_dump()
         selected_url = fiveps_data.pop("selected_image_url")
         feedback = fiveps_data.pop("feedback", None)
-        result = engine.regenerate_from_selection(fiveps_data, selected_url, feedback=feedback)
+        result = await engine.regenerate_from_selection(fiveps_data, selected_url, feedback=feedback)
         if result:
             base = str(request.base_url).rstrip('/')
             image_urls = [f"{base}{p}" for p in result]
-            return {"message": "Regenerated creatives successfully!", "image_urls": image_urls}
+            return CreativesResponse(message="Regenerated creatives successfully!", image_urls=image_urls)
         raise HTTPException(status_code=500, detail="Failed to regenerate creatives")
     except FileNotFoundError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -104,42 +124,38 @@ async def regenerate_from_selection(payload: ReGenRequest, request: Request):
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
 
 @router.post("/api/v1/cleanup")
-async def cleanup_images(payload: CleanupRequest):
+async def cleanup_images(payload: CleanupRequest) -> CleanupResponse:
     """Delete generated images under /static/generated_images. Safe-guards path traversal."""
     deleted = 0
     base_dir = os.path.join("backend", "static", "generated_images")
     os.makedirs(base_dir, exist_ok=True)
-    for url in payload.image_urls or []:
+    # Resolve the containment root once rather than per URL
+    base_abs = os.path.abspath(base_dir)
+    # Beacon + explicit cleanup often repeat URLs; visit each only once
+    for url in dict.fromkeys(payload.image_urls or []):
         try:
             # Accept absolute URLs or /static paths
-            from urllib.parse import urlparse
             path = urlparse(url).path if (url.startswith("http://") or url.startswith("https://")) else url
             if not path.startswith("/static/generated_images/"):
                 continue
             rel = path[len("/static/"):]
             fs_path = os.path.normpath(os.path.join("backend", "static", rel))
             # Ensure within base_dir
-            if not fs_path.startswith(os.path.abspath(base_dir)) and not os.path.abspath(fs_path).startswith(os.path.abspath(base_dir)):
+            if not os.path.abspath(fs_path).startswith(base_abs):
                 continue
             if os.path.isfile(fs_path):
                 os.remove(fs_path)
                 deleted += 1
         except Exception:
             continue
-    return {"deleted": deleted}
+    return CleanupResponse(deleted=deleted)
 
 @router.post("/api/v1/social_copy")
-async def social_copy(payload: SocialCopyRequest):
+async def social_copy(payload: SocialCopyRequest) -> SocialCopyResponse:
     try:
-        fiveps = {
-            "product": payload.product,
-            "price": payload.price,
-            "place": payload.place,
-            "promotion": payload.promotion,
-            "people": payload.people,
-        }
-        data = engine.generate_social_copy(payload.platform, fiveps, feedback=payload.feedback)
-        return data
+        fiveps = payload.model_dump(include=set(FIVE_PS))
+        data = await run_in_threadpool(engine.generate_social_copy, payload.platform, fiveps, feedback=payload.feedback)
+        return SocialCopyResponse(**data)
     except Exception as e:
         print(f"social_copy error: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate social copy")
@@ -1,5 +1,5 @@
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 import os
@@ -8,16 +8,14 @@ import os
 load_dotenv()
 
 from .api.routes import router
+from .api.middleware import CORSLite
 
 app = FastAPI(title="Ad Marketing Engine")
 app.add_middleware(
-    CORSMiddleware,
+    CORSLite,
     allow_origins=[
         "https://ad-marketing-engine-6g3s.vercel.app"
     ],  # or ["*"] during dev
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
 )
 
 
@@ -28,6 +26,9 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
 app.include_router(router)
 
+# Health payload never changes; serve the encoded bytes as-is
+_HEALTH_BODY = b'{"ok":true}'
+
 @app.get("/health")
-def health():
-    return {"ok": True}
+async def health():
+    return Response(content=_HEALTH_BODY, media_type="application/json")
@@ -1,15 +1,83 @@
 import os
 import io
+import asyncio
 import json
 import time
 import random
 import uuid
+import math
+import orjson
+import operator
+import shutil
+import threading
+import contextlib
 import google.generativeai as genai
 from PIL import Image, UnidentifiedImageError
 from google.api_core.exceptions import ResourceExhausted, NotFound
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 from urllib.parse import urlparse
 import hashlib
+from dataclasses import dataclass, field
+
+# The marketing-mix fields every request carries, in canonical order
+FIVE_PS = ("product", "price", "place", "promotion", "people")
+
+# The semantic cache only matches on these by embedding; the rest end up as
+# rendered price/offer text in the images, so they must match exactly
+SEMANTIC_FIELDS = ("product", "people")
+EXACT_FIELDS = ("price", "promotion", "place")
+
+# Composition/style nudges appended to the base prompt, one per variant
+VARIANT_STYLES = (
+    "studio macro shot, centered subject, soft rim lighting, condensation details",
+    "lifestyle in-situ scene, shallow depth of field, warm golden hour light",
+    "top-down flat lay composition on textured surface, high contrast",
+    "dynamic action shot with subtle motion blur, cool lighting",
+)
+
+
+@dataclass(slots=True)
+class CachedCreatives:
+    """
+    One entry of the creative cache: filesystem paths of the cache's private
+    image copies plus the optional semantic embedding and the exact-field bucket
+    it is indexed under. The copies live outside /static and are never handed to
+    clients, so /cleanup from one client cannot invalidate the entry.
+    """
+    files: tuple[str, ...]
+    embedding: list[float] | None = None
+    bucket: str | None = None
+
+
+@dataclass(slots=True)
+class KeyLock:
+    """Per-5Ps-key lock plus the number of requests holding or waiting on it."""
+    lock: asyncio.Lock
+    users: int = 0
+
+
+class VariantCancelled(RuntimeError):
+    """Raised in a variant worker once its batch was aborted by a failure or cancellation."""
+
+
+@dataclass(slots=True)
+class VariantBatch:
+    """
+    State shared by the threadpool workers of one all-or-nothing variant batch.
+    Workers record saved paths under `lock`, so abort() sees every file that
+    was kept and a late worker deletes its own file instead.
+    """
+    cancel: threading.Event = field(default_factory=threading.Event)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    saved: list[str] = field(default_factory=list)
+
+    def abort(self) -> list[str]:
+        """Stop the batch and return the web paths saved so far."""
+        with self.lock:
+            self.cancel.set()
+            return list(self.saved)
+
 
 # This class encapsulates the core logic for generating ad creatives.
 class MarketingEngine:
@@ -30,6 +98,7 @@ class MarketingEngine:
         # Model Configuration (allow override via env)
         self.text_model_name = os.getenv("GEMINI_TEXT_MODEL", "gemini-1.5-flash-latest")
         self.image_model_name = os.getenv("GEMINI_IMAGE_MODEL", "gemini-2.5-flash-image-preview")
+        self.embed_model_name = os.getenv("GEMINI_EMBED_MODEL", "models/text-embedding-004")
 
         # System instructions for the text model
         self.system_instructions = """
@@ -39,14 +108,59 @@ class MarketingEngine:
         Do not include any other text, prose, comments, or markdown formatting like ```json.
         """
 
+        # Model handles and generation configs never change after startup, so
+        # build them once here instead of on every request
+        self._brief_model = genai.GenerativeModel(
+            model_name=self.text_model_name,
+            system_instruction=self.system_instructions
+        )
+        self._brief_config = genai.GenerationConfig(
+            response_mime_type="application/json",
+            max_output_tokens=800,
+            temperature=0.4,
+        )
+        self._image_model = genai.GenerativeModel(self.image_model_name)
+        self._social_model = genai.GenerativeModel(model_name=self.text_model_name)
+        self._social_config = genai.GenerationConfig(response_mime_type="application/json", max_output_tokens=600, temperature=0.6)
+
         # In‑memory feedback memory keyed by 5Ps signature
         self._feedback_memory: dict[str, list[str]] = {}
 
-    def _call_api_with_retry(self, api_call_func, api_name="API", max_retries=5, initial_delay=10):
-        """Wrapper to handle API calls with exponential backoff for retries."""
+        # Creative cache keyed by 5Ps signature: exact matches by key, reworded
+        # 5Ps by cosine similarity of the stored embeddings (>1 disables).
+        # Bounded with FIFO eviction; entries are dropped on new feedback.
+        self._creative_cache: dict[str, CachedCreatives] = {}
+        # Semantic index: hash of EXACT_FIELDS -> 5Ps keys with an embedding
+        self._semantic_buckets: dict[str, dict[str, None]] = {}
+        self._creative_cache_size = int(os.getenv("CREATIVE_CACHE_SIZE", "512"))
+        self._semantic_threshold = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+        # Private image copies backing the cache. The index above is in-memory
+        # only, so copies left by a previous process are unreachable: start from
+        # an empty directory. Other workers sharing it just see cache misses.
+        self._cache_dir = os.path.join("backend", "cache", "creatives")
+        shutil.rmtree(self._cache_dir, ignore_errors=True)
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        # One lock per 5Ps key with a generation in flight, so concurrent
+        # identical requests wait for the first and then hit the cache.
+        # Feedback writes for the key take the same lock.
+        # Refcounted: the entry is dropped only when no request holds or awaits it.
+        self._inflight: dict[str, KeyLock] = {}
+
+        # Brief prompts keyed by (5Ps key, feedback history, current feedback),
+        # reused until any of those change; shares the creative cache bound
+        self._brief_cache: dict[tuple, str] = {}
+
+    def _call_api_with_retry(self, api_call_func, api_name="API", max_retries=5, initial_delay=10,
+                             cancel: threading.Event | None = None):
+        """Wrapper to handle API calls with exponential backoff for retries.
+        Setting `cancel` stops further attempts and wakes a pending backoff.
+        """
         retries = 0
         delay = initial_delay
         while retries < max_retries:
+            if cancel is not None and cancel.is_set():
+                raise VariantCancelled(f"{api_name} call cancelled")
             try:
                 return api_call_func()
             except ResourceExhausted as e:
@@ -55,31 +169,141 @@ class MarketingEngine:
                     raise
                 jitter = random.uniform(0, 5)
                 print(f"Quota exceeded for {api_name}. Retrying in {delay + jitter:.2f}s...")
-                time.sleep(delay + jitter)
+                if cancel is not None:
+                    cancel.wait(delay + jitter)
+                else:
+                    time.sleep(delay + jitter)
                 delay *= 2
             except Exception as e:
                 print(f"An unexpected error occurred with {api_name}: {e}")
                 raise
         raise RuntimeError(f"API call for {api_name} failed after {max_retries} retries.")
 
-
     def _key_from_5ps(self, fiveps_data: dict) -> str:
-        # Stable hash of the five P's to group a session
-        payload = json.dumps({k: fiveps_data.get(k, "") for k in ["product","price","place","promotion","people"]}, sort_keys=True)
-        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+        # Stable hash of the five P's to group a session; orjson emits UTF-8 bytes directly
+        payload = orjson.dumps({k: fiveps_data.get(k, "") for k in FIVE_PS}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha1(payload).hexdigest()
+
+    def _link_copies(self, src_paths, dst_dir: str) -> list[str]:
+        """Hardlink (or copy) files into dst_dir under fresh uuid names; returns the new paths.
+        Each caller owns the returned files, so deleting them never affects the source.
+        """
+        out = []
+        try:
+            for src in src_paths:
+                dst = os.path.join(dst_dir, f"{uuid.uuid4()}.png")
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    shutil.copyfile(src, dst)
+                out.append(dst)
+        except Exception:
+            self._remove_files(out)
+            raise
+        return out
+
+    def _remove_files(self, paths):
+        """Best-effort delete of files by filesystem path."""
+        for p in paths:
+            try:
+                os.remove(p)
+            except OSError:
+                continue
+
+    def _remove_images(self, web_paths):
+        """Best-effort delete of generated images by web path."""
+        for p in web_paths:
+            try:
+                os.remove(self._resolve_local_static_path(p))
+            except (ValueError, OSError):
+                continue
+
+    def _cached_creatives(self, key: str) -> list[str] | None:
+        """Return fresh per-request copies of the cached images for a 5Ps key, if any."""
+        entry = self._creative_cache.get(key)
+        if entry is None:
+            return None
+        try:
+            copies = self._link_copies(entry.files, os.path.join("backend", "static", "generated_images"))
+        except OSError:
+            # Cache files are gone; treat as a miss
+            self._drop_creatives(key)
+            return None
+        return [f"/static/generated_images/{os.path.basename(p)}" for p in copies]
+
+    def _store_creatives(self, key: str, web_paths: list[str], embedding: list[float] | None = None,
+                         bucket: str | None = None):
+        if self._creative_cache_size <= 0:
+            return
+        try:
+            private = self._link_copies([self._resolve_local_static_path(p) for p in web_paths], self._cache_dir)
+        except (ValueError, OSError) as e:
+            print(f"Could not cache creatives: {e}")
+            return
+        self._drop_creatives(key)
+        while len(self._creative_cache) >= self._creative_cache_size:
+            self._drop_creatives(next(iter(self._creative_cache)))
+        self._creative_cache[key] = CachedCreatives(tuple(private), embedding, bucket)
+        if embedding is not None and bucket is not None:
+            self._semantic_buckets.setdefault(bucket, {})[key] = None
+
+    def _drop_creatives(self, key: str):
+        """Remove a cache entry and delete its private image copies."""
+        entry = self._creative_cache.pop(key, None)
+        if entry is None:
+            return
+        self._remove_files(entry.files)
+        keys = self._semantic_buckets.get(entry.bucket)
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self._semantic_buckets[entry.bucket]
+
+    def _bucket_from_5ps(self, fiveps_data: dict) -> str:
+        # Semantic matches are only considered within identical EXACT_FIELDS
+        payload = orjson.dumps({k: fiveps_data.get(k, "") for k in EXACT_FIELDS}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha1(payload).hexdigest()
+
+    def _embed_5ps(self, fiveps_data: dict) -> list[float] | None:
+        """Unit-normalised embedding of SEMANTIC_FIELDS, or None if the embedding call fails."""
+        text = "\n".join(f"{k}: {fiveps_data.get(k, '')}" for k in SEMANTIC_FIELDS)
+        try:
+            resp = genai.embed_content(model=self.embed_model_name, content=text)
+            vec = resp["embedding"]
+        except Exception as e:
+            print(f"Embedding unavailable, skipping semantic cache: {e}")
+            return None
+        norm = math.sqrt(sum(v * v for v in vec))
+        return [v / norm for v in vec] if norm else None
+
+    def _semantic_lookup(self, embedding: list[float], bucket: str) -> str | None:
+        """Key of the most similar cached 5Ps in the bucket at or above the threshold, if any."""
+        best_key, best_score = None, self._semantic_threshold
+        for key in self._semantic_buckets.get(bucket, ()):
+            entry = self._creative_cache[key]
+            score = sum(map(operator.mul, embedding, entry.embedding))
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    async def _brief_for(self, fiveps_data, current_feedback: str | None = None) -> str:
+        """Return the creative brief prompt, calling the text model only for unseen inputs."""
+        key = self._key_from_5ps(fiveps_data)
+        brief_key = (key, tuple(self._feedback_memory.get(key, [])), (current_feedback or "").strip())
+        prompt = self._brief_cache.get(brief_key)
+        if prompt is not None:
+            print("Step 1: Reusing cached creative brief")
+            return prompt
+        prompt = await run_in_threadpool(self._generate_brief_from_5ps, fiveps_data, current_feedback=current_feedback)
+        if self._creative_cache_size > 0:
+            while len(self._brief_cache) >= self._creative_cache_size:
+                self._brief_cache.pop(next(iter(self._brief_cache)))
+            self._brief_cache[brief_key] = prompt
+        return prompt
 
     def _generate_brief_from_5ps(self, fiveps_data, current_feedback: str | None = None):
         """Step 1: Calls the text model to get a JSON creative brief."""
         print("Step 1: Generating creative brief...")
-        text_model = genai.GenerativeModel(
-            model_name=self.text_model_name,
-            system_instruction=self.system_instructions
-        )
-        generation_config = genai.GenerationConfig(
-            response_mime_type="application/json",
-            max_output_tokens=800,
-            temperature=0.4,
-        )
 
         # Pull feedback history for this 5Ps set and include in the payload
         key = self._key_from_5ps(fiveps_data)
@@ -93,9 +317,9 @@ class MarketingEngine:
         }
 
         def api_call():
-            return text_model.generate_content(
+            return self._brief_model.generate_content(
                 json.dumps(payload),
-                generation_config=generation_config
+                generation_config=self._brief_config
             )
 
         response = self._call_api_with_retry(api_call, "Text Model")
@@ -112,21 +336,18 @@ class MarketingEngine:
             
         return prompt
 
-    def _generate_image_from_prompt(self, prompt):
+    def _generate_image_from_prompt(self, prompt, cancel: threading.Event | None = None):
         """Step 2: Calls the image model to generate an image from the prompt."""
         print("\nStep 2: Generating image from prompt...")
         print(f"Prompt: {prompt}")
-        
-        image_model = genai.GenerativeModel(self.image_model_name)
 
         def api_call():
-            return image_model.generate_content(prompt)
+            return self._image_model.generate_content(prompt)
 
-        img_resp = self._call_api_with_retry(api_call, "Image Model")
+        img_resp = self._call_api_with_retry(api_call, "Image Model", cancel=cancel)
 
         try:
-            image_part = next(p for p in img_resp.candidates[0].content.parts if p.inline_data.mime_type.startswith("image/"))
-            return image_part.inline_data.data
+            return self._extract_inline_image(img_resp)
         except (StopIteration, IndexError, AttributeError):
             raise RuntimeError(f"Could not extract image data from API response. Full response:\n{img_resp}")
 
@@ -134,11 +355,12 @@ class MarketingEngine:
         image_part = next(p for p in resp.candidates[0].content.parts if getattr(getattr(p, "inline_data", None), "mime_type", "").startswith("image/"))
         return image_part.inline_data.data
 
-    def _generate_image_from_prompt_with_reference(self, prompt: str, ref_image_path: str):
+    def _generate_image_from_prompt_with_reference(self, prompt: str, ref_image_path: str,
+                                                   cancel: threading.Event | None = None):
         """Generate a new image using a reference image + text prompt.
         Falls back to text-only generation if the model doesn't emit an image with reference input.
         """
-        image_model = genai.GenerativeModel(self.image_model_name)
+        image_model = self._image_model
 
         # 1) Try file-upload + reference conditioned generation (if supported by the model)
         try:
@@ -147,7 +369,7 @@ class MarketingEngine:
             def api_call_ref():
                 return image_model.generate_content([uploaded, prompt])
 
-            img_resp = self._call_api_with_retry(api_call_ref, "Image Model (with reference)")
+            img_resp = self._call_api_with_retry(api_call_ref, "Image Model (with reference)", cancel=cancel)
             try:
                 return self._extract_inline_image(img_resp)
             except (StopIteration, IndexError, AttributeError):
@@ -161,7 +383,7 @@ class MarketingEngine:
         def api_call_text():
             return image_model.generate_content(f"{prompt}. Keep visual style consistent with the previously selected reference image: similar palette, lighting, and composition cues.")
 
-        img_resp2 = self._call_api_with_retry(api_call_text, "Image Model (text-only fallback)")
+        img_resp2 = self._call_api_with_retry(api_call_text, "Image Model (text-only fallback)", cancel=cancel)
         try:
             return self._extract_inline_image(img_resp2)
         except (StopIteration, IndexError, AttributeError):
@@ -172,42 +394,125 @@ class MarketingEngine:
         Create related-but-different variants by nudging composition/style.
         Keeps the core prompt intact and adds lightweight directives.
         """
-        variants = [
-            "studio macro shot, centered subject, soft rim lighting, condensation details",
-            "lifestyle in-situ scene, shallow depth of field, warm golden hour light",
-            "top-down flat lay composition on textured surface, high contrast",
-            "dynamic action shot with subtle motion blur, cool lighting",
-        ]
-        out = []
         fb = (feedback or "").strip()
         fb_str = f" Incorporate feedback: {fb}." if fb else ""
-        for v in variants:
-            out.append(f"{base_prompt} — {v}.{fb_str}")
-        return out
+        return [f"{base_prompt} — {v}.{fb_str}" for v in VARIANT_STYLES]
 
-    def generate_creative(self, fiveps_data):
+    def _generate_variant(self, prompt: str, output_dir: str, ref_image_path: str | None = None,
+                          batch: VariantBatch | None = None) -> str:
+        """Generate one image (optionally reference-conditioned), save it and return its web path.
+        A failure cancels the batch so sibling variants stop instead of finishing unused work.
+        """
+        cancel = batch.cancel if batch is not None else None
+        try:
+            if ref_image_path:
+                img_bytes = self._generate_image_from_prompt_with_reference(prompt, ref_image_path, cancel=cancel)
+            else:
+                img_bytes = self._generate_image_from_prompt(prompt, cancel=cancel)
+            if cancel is not None and cancel.is_set():
+                raise VariantCancelled("batch aborted; not saving")
+        except VariantCancelled:
+            raise
+        except Exception:
+            if cancel is not None:
+                cancel.set()
+            raise
+        filename = f"{uuid.uuid4()}.png"
+        filepath = os.path.join(output_dir, filename)
+        self._save_png_white_bg(img_bytes, filepath)
+        web_path = f"/static/generated_images/{filename}"
+        if batch is not None:
+            with batch.lock:
+                if not batch.cancel.is_set():
+                    batch.saved.append(web_path)
+                    return web_path
+            # Aborted while saving; nobody else knows about this file
+            self._remove_files([filepath])
+            raise VariantCancelled("batch aborted; not keeping image")
+        return web_path
+
+    async def _generate_variants(self, prompts, output_dir: str, ref_image_path: str | None = None) -> list[str]:
+        """Generate all variants concurrently; all-or-nothing.
+        If any variant fails or the request is cancelled, the others are
+        signalled to stop and any images already saved are deleted; on failure
+        the first real error is raised.
+        """
+        batch = VariantBatch()
+        try:
+            results = await asyncio.gather(
+                *(run_in_threadpool(self._generate_variant, p, output_dir, ref_image_path, batch) for p in prompts),
+                return_exceptions=True,
+            )
+        except asyncio.CancelledError:
+            # Client went away; stop the workers still in the threadpool
+            self._remove_images(batch.abort())
+            raise
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            self._remove_images(batch.abort())
+            raise next((e for e in errors if not isinstance(e, VariantCancelled)), errors[0])
+        return results
+
+    async def generate_creative(self, fiveps_data):
         """
         Executes the full workflow: 5Ps -> Brief -> Image.
-        Saves the image to a file and returns its path.
+        Saves the images to files and returns their paths; the blocking
+        model calls run in the threadpool, with the variants generated concurrently.
+        Identical 5Ps are served from the exact-match cache as fresh per-request copies.
         """
+        key = self._key_from_5ps(fiveps_data)
+        async with self._key_lock(key):
+            return await self._generate_creative_for_key(key, fiveps_data)
+
+    @contextlib.asynccontextmanager
+    async def _key_lock(self, key: str):
+        """Hold the per-5Ps-key lock guarding that key's cache entry and feedback."""
+        slot = self._inflight.get(key)
+        if slot is None:
+            slot = self._inflight[key] = KeyLock(asyncio.Lock())
+        slot.users += 1
+        try:
+            async with slot.lock:
+                yield
+        finally:
+            slot.users -= 1
+            if slot.users == 0 and self._inflight.get(key) is slot:
+                del self._inflight[key]
+
+    async def _generate_creative_for_key(self, key: str, fiveps_data):
+        cached = self._cached_creatives(key)
+        if cached is not None:
+            print(f"Cache hit: reusing {len(cached)} images for identical 5Ps")
+            return cached
+
+        # Semantic lookup for reworded 5Ps; skipped once this 5Ps set has its
+        # own feedback, which a neighbour's images would not reflect
+        embedding = None
+        bucket = self._bucket_from_5ps(fiveps_data)
+        if self._creative_cache_size > 0 and self._semantic_threshold <= 1 and not self._feedback_memory.get(key):
+            embedding = await run_in_threadpool(self._embed_5ps, fiveps_data)
+            near = self._semantic_lookup(embedding, bucket) if embedding is not None else None
+            cached = self._cached_creatives(near) if near is not None else None
+            if cached is not None:
+                print(f"Semantic cache hit: reusing {len(cached)} images for similar 5Ps")
+                return cached
+
         # Ensure output directory exists
         output_dir = "backend/static/generated_images"
         os.makedirs(output_dir, exist_ok=True)
 
+        # Feedback that lands mid-generation makes these images stale for later requests
+        history = tuple(self._feedback_memory.get(key, []))
         try:
-            prompt = self._generate_brief_from_5ps(fiveps_data)
+            prompt = await self._brief_for(fiveps_data)
             # Build 4 related variants (initially no feedback)
             prompts = self._variant_prompts(prompt, feedback=None)
 
-            web_paths = []
-            for p in prompts:
-                img_bytes = self._generate_image_from_prompt(p)
-                filename = f"{uuid.uuid4()}.png"
-                filepath = os.path.join(output_dir, filename)
-                self._save_png_white_bg(img_bytes, filepath)
-                web_paths.append(f"/static/generated_images/{filename}")
+            web_paths = await self._generate_variants(prompts, output_dir)
 
             print(f"\n✅ Success! Generated {len(web_paths)} images under {output_dir}")
+            if tuple(self._feedback_memory.get(key, [])) == history:
+                self._store_creatives(key, web_paths, embedding=embedding, bucket=bucket)
             # Return the list; keep first for backward compatibility at the route layer
             return web_paths
 
@@ -228,11 +533,11 @@ class MarketingEngine:
             raise FileNotFoundError(f"Selected image not found: {fs_path}")
         return fs_path
 
-    def regenerate_from_selection(self, fiveps_data, selected_image_url: str, feedback: str | None = None):
+    async def regenerate_from_selection(self, fiveps_data, selected_image_url: str, feedback: str | None = None):
         """
         Given the user's selected image and original 5Ps, generate 4 related variants
         that maintain the reference style while exploring new compositions.
-        Returns a list of web paths.
+        Variants are generated concurrently. Returns a list of web paths.
         """
         output_dir = "backend/static/generated_images"
         os.makedirs(output_dir, exist_ok=True)
@@ -241,22 +546,23 @@ class MarketingEngine:
         # Log feedback into memory so it compounds across regenerations
         key = self._key_from_5ps(fiveps_data)
         if feedback:
-            self._feedback_memory.setdefault(key, []).append(feedback)
-        prompt = self._generate_brief_from_5ps(fiveps_data, current_feedback=feedback)
+            # Taken after any in-flight /generate for this key has stored its images
+            async with self._key_lock(key):
+                self._feedback_memory.setdefault(key, []).append(feedback)
+                # Feedback changes the brief, so cached creatives are now stale
+                self._drop_creatives(key)
+        prompt = await self._brief_for(fiveps_data, current_feedback=feedback)
         prompts = self._variant_prompts(prompt, feedback=feedback)
 
         # 2) Load reference image from local static path
         fs_path = self._resolve_local_static_path(selected_image_url)
 
         # 3) Generate 4 variants conditioned on the reference image
-        web_paths = []
-        for p in prompts:
-            enriched = f"{p} — maintain visual style and theme of the reference image"
-            img_bytes = self._generate_image_from_prompt_with_reference(enriched, fs_path)
-            filename = f"{uuid.uuid4()}.png"
-            filepath = os.path.join(output_dir, filename)
-            self._save_png_white_bg(img_bytes, filepath)
-            web_paths.append(f"/static/generated_images/{filename}")
+        web_paths = await self._generate_variants(
+            [f"{p} — maintain visual style and theme of the reference image" for p in prompts],
+            output_dir,
+            fs_path,
+        )
 
         print(f"\n✅ Success! Regenerated {len(web_paths)} images from selection under {output_dir}")
         return web_paths
@@ -294,9 +600,6 @@ class MarketingEngine:
             "youtube": "Title <= 70 chars; description <= 4,000 chars, first line compelling.",
         }[plat]
 
-        text_model = genai.GenerativeModel(model_name=self.text_model_name)
-        gen_cfg = genai.GenerationConfig(response_mime_type="application/json", max_output_tokens=600, temperature=0.6)
-
         key = self._key_from_5ps(fiveps_data)
         history = self._feedback_memory.get(key, [])
         payload = {
@@ -310,7 +613,7 @@ class MarketingEngine:
             "You are a social media copywriter. Create platform-tailored copy from the 5Ps and feedback.\n"
             "Return ONLY JSON with keys: title, caption, hashtags (array). Keep it safe and brand-appropriate."
         )
-        resp = text_model.generate_content([prompt, json.dumps(payload)], generation_config=gen_cfg)
+        resp = self._social_model.generate_content([prompt, json.dumps(payload)], generation_config=self._social_config)
         txt = getattr(resp, "text", "{}")
         try:
             data = json.loads(txt.strip().strip("`"))
@@ -0,0 +1,60 @@
+import io
+from collections import Counter
+
+import pytest
+import google.generativeai as genai
+from PIL import Image
+
+from backend.services.marketing_engine import MarketingEngine
+
+
+class _FakeModel:
+    """Stands in for genai.GenerativeModel; tests stub the engine's call sites."""
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+def _png_bytes() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (4, 4), (200, 30, 30)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def fiveps():
+    """A fresh 5Ps payload per test."""
+    return {
+        "product": "Sugar-free energy drink",
+        "price": "$2 per can",
+        "place": "Campus stores",
+        "promotion": "20% off this week",
+        "people": "Students 18-24",
+    }
+
+
+@pytest.fixture
+def engine(monkeypatch, tmp_path):
+    """MarketingEngine with Gemini stubbed out, writing images under tmp_path."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setenv("SEMANTIC_CACHE_THRESHOLD", "2")  # semantic tests opt in
+    monkeypatch.setattr(genai, "configure", lambda **kwargs: None)
+    monkeypatch.setattr(genai, "GenerativeModel", _FakeModel)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "backend" / "static" / "generated_images").mkdir(parents=True)
+
+    eng = MarketingEngine()
+    eng.calls = Counter()
+    png = _png_bytes()
+
+    def brief(fiveps_data, current_feedback=None):
+        eng.calls["brief"] += 1
+        return "prompt"
+
+    def image(prompt, cancel=None):
+        eng.calls["image"] += 1
+        return png
+
+    monkeypatch.setattr(eng, "_generate_brief_from_5ps", brief)
+    monkeypatch.setattr(eng, "_generate_image_from_prompt", image)
+    monkeypatch.setattr(eng, "_generate_image_from_prompt_with_reference", lambda prompt, ref, cancel=None: image(prompt, cancel))
+    return eng
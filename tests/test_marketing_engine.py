@@ -0,0 +1,234 @@
+import asyncio
+import os
+
+
+def _fs(web_path: str) -> str:
+    return os.path.join("backend", web_path.lstrip("/"))
+
+
+def test_cache_hit_returns_fresh_copies(engine, fiveps):
+    first = asyncio.run(engine.generate_creative(dict(fiveps)))
+    second = asyncio.run(engine.generate_creative(dict(fiveps)))
+
+    assert engine.calls["image"] == 4
+    assert len(second) == 4
+    assert set(first).isdisjoint(second)
+    assert all(os.path.isfile(_fs(p)) for p in first + second)
+
+
+def test_cleanup_by_one_client_keeps_cache_and_other_client(engine, fiveps):
+    first = asyncio.run(engine.generate_creative(dict(fiveps)))
+    second = asyncio.run(engine.generate_creative(dict(fiveps)))
+
+    # Both clients leave the page and clean up their own images
+    for p in first:
+        os.remove(_fs(p))
+    assert all(os.path.isfile(_fs(p)) for p in second)
+
+    for p in second:
+        os.remove(_fs(p))
+    third = asyncio.run(engine.generate_creative(dict(fiveps)))
+    assert engine.calls["image"] == 4
+    assert all(os.path.isfile(_fs(p)) for p in third)
+
+
+def test_cache_copies_stay_private_and_are_cleared_on_restart(engine, fiveps):
+    from backend.services.marketing_engine import MarketingEngine
+
+    first = asyncio.run(engine.generate_creative(dict(fiveps)))
+    for p in first:
+        os.remove(_fs(p))
+
+    # The client cleaned up everything it was given; only the cache's copies remain
+    assert os.listdir(os.path.join("backend", "static", "generated_images")) == []
+    assert len(os.listdir(engine._cache_dir)) == 4
+
+    # A restarted process cannot reach the old copies, so it clears them
+    restarted = MarketingEngine()
+    assert os.listdir(restarted._cache_dir) == []
+
+
+def test_feedback_drops_cached_images(engine, fiveps):
+    first = asyncio.run(engine.generate_creative(dict(fiveps)))
+    asyncio.run(engine.regenerate_from_selection(dict(fiveps), first[0], feedback="more blue"))
+
+    assert not engine._creative_cache
+    assert os.listdir(engine._cache_dir) == []
+    # Only the client's own files (4 generated + 4 regenerated) remain
+    assert len(os.listdir(os.path.join("backend", "static", "generated_images"))) == 8
+
+
+def test_feedback_during_generation_is_not_masked_by_stale_cache(engine, fiveps, monkeypatch):
+    import threading
+
+    from PIL import Image
+
+    selected = os.path.join("backend", "static", "generated_images", "selected.png")
+    Image.new("RGB", (4, 4)).save(selected)
+    release = threading.Event()
+    histories = []
+
+    def brief(fiveps_data, current_feedback=None):
+        engine.calls["brief"] += 1
+        histories.append(list(engine._feedback_memory.get(engine._key_from_5ps(fiveps_data), [])))
+        if engine.calls["brief"] == 1:
+            release.wait(5)  # hold the first /generate in flight
+        return "prompt"
+
+    monkeypatch.setattr(engine, "_generate_brief_from_5ps", brief)
+
+    async def main():
+        gen = asyncio.create_task(engine.generate_creative(dict(fiveps)))
+        while not engine.calls["brief"]:
+            await asyncio.sleep(0.01)
+        regen = asyncio.create_task(
+            engine.regenerate_from_selection(dict(fiveps), "/static/generated_images/selected.png", feedback="more blue")
+        )
+        await asyncio.sleep(0)
+        # Feedback waits for the in-flight /generate instead of racing its store
+        feedback_during_generate = list(engine._feedback_memory.values())
+        release.set()
+        await gen
+        await regen
+        return feedback_during_generate
+
+    feedback_during_generate = asyncio.run(main())
+    asyncio.run(engine.generate_creative(dict(fiveps)))
+
+    assert feedback_during_generate == []
+    assert engine._inflight == {}
+    # The post-feedback /generate rebuilds with the feedback instead of reusing pre-feedback images
+    assert engine.calls["image"] == 12
+    assert histories[-1] == ["more blue"]
+
+
+def _enable_semantic_cache(engine, monkeypatch):
+    import google.generativeai as genai
+
+    texts = []
+
+    def embed_content(model=None, content=None, **kwargs):
+        # Every text embeds identically, so only the bucketing decides a hit
+        texts.append(content)
+        return {"embedding": [1.0, 0.0]}
+
+    monkeypatch.setattr(genai, "embed_content", embed_content)
+    engine._semantic_threshold = 0.92
+    return texts
+
+
+def test_semantic_hit_for_reworded_product(engine, fiveps, monkeypatch):
+    texts = _enable_semantic_cache(engine, monkeypatch)
+    asyncio.run(engine.generate_creative(dict(fiveps)))
+    reworded = dict(fiveps, product="Energy drink, zero sugar", people="College students")
+    result = asyncio.run(engine.generate_creative(reworded))
+
+    assert len(result) == 4
+    assert engine.calls["image"] == 4
+    # Only product and people are embedded
+    assert all("price" not in t and "promotion" not in t for t in texts)
+
+
+def test_semantic_miss_when_price_or_offer_changes(engine, fiveps, monkeypatch):
+    _enable_semantic_cache(engine, monkeypatch)
+    asyncio.run(engine.generate_creative(dict(fiveps)))
+    asyncio.run(engine.generate_creative(dict(fiveps, price="$20 per can")))
+    assert engine.calls["image"] == 8
+    asyncio.run(engine.generate_creative(dict(fiveps, promotion="50% off this week")))
+    assert engine.calls["image"] == 12
+
+
+def test_failed_variant_stops_siblings_and_removes_saved_images(engine, fiveps, monkeypatch):
+    import time
+
+    png = engine._generate_image_from_prompt("warmup")
+
+    def image(prompt, cancel=None):
+        if "lifestyle" in prompt:
+            raise RuntimeError("model returned no image")
+        if "dynamic" in prompt:
+            # A slow sibling: must be woken by the failure and not save
+            cancel.wait(5)
+        return png
+
+    monkeypatch.setattr(engine, "_generate_image_from_prompt", image)
+    started = time.monotonic()
+    result = asyncio.run(engine.generate_creative(dict(fiveps)))
+
+    assert result is None
+    assert time.monotonic() - started < 5
+    assert os.listdir(os.path.join("backend", "static", "generated_images")) == []
+    assert not engine._creative_cache
+
+
+def test_cancelled_request_removes_saved_variants(engine, fiveps, monkeypatch):
+    images_dir = os.path.join("backend", "static", "generated_images")
+    png = engine._generate_image_from_prompt("warmup")
+
+    def image(prompt, cancel=None):
+        if "lifestyle" in prompt:
+            cancel.wait(5)  # still running when the client disconnects
+        return png
+
+    monkeypatch.setattr(engine, "_generate_image_from_prompt", image)
+
+    async def main():
+        task = asyncio.create_task(engine.generate_creative(dict(fiveps)))
+        while len(os.listdir(images_dir)) < 3:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # The woken worker finishes in the threadpool after the request is gone
+        for _ in range(100):
+            if not os.listdir(images_dir):
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+
+    assert os.listdir(images_dir) == []
+    assert not engine._creative_cache
+
+
+def test_concurrent_identical_requests_generate_once(engine, fiveps):
+    async def main():
+        return await asyncio.gather(*(engine.generate_creative(dict(fiveps)) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert engine.calls["brief"] == 1
+    assert engine.calls["image"] == 4
+    assert all(r is not None and len(r) == 4 for r in results)
+    assert engine._inflight == {}
+
+
+def test_waiters_stay_single_flight_after_leader_fails(engine, fiveps, monkeypatch):
+    import time
+
+    def brief(fiveps_data, current_feedback=None):
+        engine.calls["brief"] += 1
+        if engine.calls["brief"] == 1:
+            raise ValueError("leader fails")
+        time.sleep(0.2)  # keep the second generation in flight while C arrives
+        return "prompt"
+
+    monkeypatch.setattr(engine, "_generate_brief_from_5ps", brief)
+
+    async def main():
+        a = asyncio.create_task(engine.generate_creative(dict(fiveps)))
+        b = asyncio.create_task(engine.generate_creative(dict(fiveps)))
+        result_a = await a
+        # C arrives after A finished while B (queued behind A) is generating
+        c = asyncio.create_task(engine.generate_creative(dict(fiveps)))
+        return result_a, await b, await c
+
+    result_a, result_b, result_c = asyncio.run(main())
+
+    assert result_a is None
+    assert result_b is not None and result_c is not None
+    assert engine.calls["brief"] == 2
+    assert engine.calls["image"] == 4
+    assert engine._inflight == {}
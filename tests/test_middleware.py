@@ -0,0 +1,57 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.datastructures import MutableHeaders
+
+from backend.api.middleware import CORSLite
+
+ORIGIN = "https://app.example"
+PREFLIGHT = {"origin": ORIGIN, "access-control-request-method": "POST"}
+
+
+class _AppendHeader:
+    """Outer middleware that edits response headers in place, like SessionMiddleware."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("x-outer", "1")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _client():
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(CORSLite, allow_origins=[ORIGIN])
+    app.add_middleware(_AppendHeader)
+    return TestClient(app)
+
+
+def test_preflight_is_answered_without_routing():
+    r = _client().options("/ping", headers=dict(PREFLIGHT, **{"access-control-request-headers": "content-type"}))
+    assert r.status_code == 204
+    assert r.headers["access-control-allow-origin"] == ORIGIN
+    assert r.headers["access-control-allow-headers"] == "content-type"
+
+
+def test_outer_header_edits_do_not_leak_into_prebuilt_headers():
+    client = _client()
+    for _ in range(3):
+        r = client.options("/ping", headers=PREFLIGHT)
+        assert r.headers.get_list("x-outer") == ["1"]
+        r = client.options("/ping", headers=dict(PREFLIGHT, origin="https://evil.example"))
+        assert r.status_code == 400
+        assert r.headers.get_list("x-outer") == ["1"]
+
+
+def test_simple_request_from_disallowed_origin_gets_no_cors_headers():
+    r = _client().get("/ping", headers={"origin": "https://evil.example"})
+    assert r.status_code == 200
+    assert "access-control-allow-origin" not in r.headers